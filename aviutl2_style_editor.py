@@ -6,27 +6,602 @@ AviUtl2 样式配置编辑器
 支持多语言界面：中文、英文、日文
 """
 
-import gradio as gr
 import configparser
 import os
+import sys
 import json
 import argparse
 from pathlib import Path
 import re
+import time
+import atexit
+import threading
+import functools
+import math
+import array
+import itertools
+import struct
+
+# 预编译的颜色格式正则
+COLOR_HEX_PATTERN = re.compile(r'^[0-9a-fA-F]{6}$')
+COLOR_RGBA_PATTERN = re.compile(r'rgba?\s*\(\s*([0-9.]+)\s*,\s*([0-9.]+)\s*,\s*([0-9.]+)(?:\s*,\s*[0-9.]*)?\s*\)', re.IGNORECASE)
+
+def get_resource_dir():
+    """获取资源文件所在目录（兼容PyInstaller打包后的运行环境）"""
+    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
+        return sys._MEIPASS
+    return os.path.dirname(os.path.abspath(__file__))
+
+class StartupTimer:
+    """记录启动各阶段耗时"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, phase):
+        """记录从上一个阶段结束到现在的耗时"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        """返回各阶段耗时（毫秒）"""
+        return {
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'phases_ms': {phase: elapsed * 1000 for phase, elapsed in self.phases},
+            'total_ms': (self.last - self.start) * 1000,
+        }
+
+    def format_report(self):
+        """将启动耗时格式化为文本"""
+        report = self.report()
+        lines = ["=== 启动耗时 / Startup time ==="]
+        for phase, elapsed in report['phases_ms'].items():
+            lines.append(f"  {phase:<20}{elapsed:>10.1f} ms")
+        lines.append(f"  {'total':<20}{report['total_ms']:>10.1f} ms")
+        return "\n".join(lines)
+
+# 模块导入完成即开始计时
+STARTUP_TIMER = StartupTimer()
+
+class CallbackProfiler:
+    """Gradio回调性能分析器 - 统计每个回调的耗时、分配内存，可选cProfile"""
+
+    # 耗时直方图的桶边界（毫秒）
+    HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+    def __init__(self, use_cprofile=False, use_tracemalloc=False, output_file=None):
+        self.use_cprofile = use_cprofile
+        self.use_tracemalloc = use_tracemalloc
+        self.output_file = output_file
+        self.durations = {}
+        self.allocations = {}
+        self.errors = {}
+        self.profiles = {}
+        self._lock = threading.Lock()
+        # cProfile同一时间只能有一个活动的分析器，tracemalloc的峰值统计是进程全局的，
+        # 启用任意一个时都需要串行执行回调，否则并发回调的数据会互相混入
+        self._serial_lock = threading.Lock()
+
+        if self.use_tracemalloc:
+            import tracemalloc
+            tracemalloc.start()
+        if self.output_file:
+            atexit.register(self.dump)
+
+    def wrap(self, name, fn):
+        """包装回调函数，记录每次调用的耗时"""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if self.use_cprofile or self.use_tracemalloc:
+                with self._serial_lock:
+                    return self._call(name, fn, args, kwargs)
+            return self._call(name, fn, args, kwargs)
+        return wrapper
+
+    def _call(self, name, fn, args, kwargs):
+        # 分析模块只在启用 --profile 时才导入
+        import cProfile
+        import tracemalloc
+        profile = None
+        if self.use_cprofile:
+            profile = cProfile.Profile()
+        if self.use_tracemalloc:
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            mem_before = tracemalloc.get_traced_memory()[0]
+
+        failed = False
+        start = time.perf_counter()
+        try:
+            if profile is not None:
+                return profile.runcall(fn, *args, **kwargs)
+            return fn(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = None
+            if self.use_tracemalloc:
+                allocated = max(0, tracemalloc.get_traced_memory()[1] - mem_before)
+            self._record(name, elapsed, allocated, profile, failed)
+
+    def _record(self, name, elapsed, allocated, profile, failed):
+        import pstats
+        with self._lock:
+            self.durations.setdefault(name, []).append(elapsed)
+            if allocated is not None:
+                self.allocations.setdefault(name, []).append(allocated)
+            if failed:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            if profile is not None:
+                if name in self.profiles:
+                    self.profiles[name].add(profile)
+                else:
+                    self.profiles[name] = pstats.Stats(profile)
+
+    @staticmethod
+    def _percentile(sorted_values, percent):
+        """最近秩法计算百分位数"""
+        if not sorted_values:
+            return 0.0
+        index = max(0, math.ceil(percent / 100.0 * len(sorted_values)) - 1)
+        return sorted_values[index]
+
+    def summary(self):
+        """汇总每个回调的统计信息"""
+        with self._lock:
+            durations = {name: list(values) for name, values in self.durations.items()}
+            allocations = {name: list(values) for name, values in self.allocations.items()}
+            errors = dict(self.errors)
+
+        result = {}
+        for name, values in durations.items():
+            values.sort()
+            values_ms = [v * 1000 for v in values]
+            histogram = {}
+            for bucket in self.HISTOGRAM_BUCKETS_MS:
+                histogram[f"<={bucket}ms"] = 0
+            histogram[f">{self.HISTOGRAM_BUCKETS_MS[-1]}ms"] = 0
+            for value in values_ms:
+                for bucket in self.HISTOGRAM_BUCKETS_MS:
+                    if value <= bucket:
+                        histogram[f"<={bucket}ms"] += 1
+                        break
+                else:
+                    histogram[f">{self.HISTOGRAM_BUCKETS_MS[-1]}ms"] += 1
+
+            stats = {
+                'count': len(values_ms),
+                'errors': errors.get(name, 0),
+                'total_ms': sum(values_ms),
+                'p50_ms': self._percentile(values_ms, 50),
+                'p99_ms': self._percentile(values_ms, 99),
+                'max_ms': values_ms[-1],
+                'histogram': histogram,
+            }
+            if name in allocations:
+                allocs = sorted(allocations[name])
+                stats['alloc_p50_bytes'] = self._percentile(allocs, 50)
+                stats['alloc_max_bytes'] = allocs[-1]
+            result[name] = stats
+        return result
+
+    def format_summary(self):
+        """将统计信息格式化为文本表格"""
+        summary = self.summary()
+        if not summary:
+            return "(no callbacks recorded yet)"
+
+        lines = [f"{'callback':<24}{'count':>8}{'errors':>8}{'p50(ms)':>12}{'p99(ms)':>12}{'max(ms)':>12}{'alloc p50':>12}"]
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]['total_ms']):
+            alloc = stats.get('alloc_p50_bytes')
+            alloc_text = f"{alloc}" if alloc is not None else "-"
+            lines.append(f"{name:<24}{stats['count']:>8}{stats['errors']:>8}{stats['p50_ms']:>12.2f}"
+                         f"{stats['p99_ms']:>12.2f}{stats['max_ms']:>12.2f}{alloc_text:>12}")
+        lines.append("")
+        for name, stats in sorted(summary.items()):
+            buckets = ", ".join(f"{bucket}: {count}" for bucket, count in stats['histogram'].items() if count)
+            lines.append(f"{name}: {buckets}")
+        return "\n".join(lines)
+
+    def dump(self, output_file=None):
+        """将统计结果写入JSON文件，cProfile结果写入同名.prof文件，返回是否成功"""
+        output_file = output_file or self.output_file
+        if not output_file:
+            return False
+        try:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+            with self._lock:
+                profiles = dict(self.profiles)
+            base = os.path.splitext(output_file)[0]
+            for name, stats in profiles.items():
+                stats.dump_stats(f"{base}.{name}.prof")
+            print(f"性能分析结果已保存: {output_file}")
+            return True
+        except Exception as e:
+            print(f"保存性能分析结果失败: {e}")
+            return False
+
+class InternedDict(dict):
+    """写入时驻留字符串的字典，使多个配置文件中相同的键和值共享同一个对象"""
+
+    def __setitem__(self, key, value):
+        if isinstance(key, str):
+            key = sys.intern(key)
+        if isinstance(value, str):
+            value = sys.intern(value)
+        super().__setitem__(key, value)
+
+def create_style_config(dict_type=dict):
+    """创建用于style.conf的ConfigParser"""
+    # style.conf中的%没有插值含义，关闭插值以便原样读写
+    config = configparser.ConfigParser(dict_type=dict_type, interpolation=None)
+    # 保持键的大小写 - 禁用自动转换为小写
+    config.optionxform = lambda optionstr: optionstr
+    return config
+
+# 主题导出格式
+THEME_FORMAT_NAME = "aviutl2-style"
+THEME_FORMAT_VERSION = 1
+THEME_JSON_EXTENSIONS = ('.json',)
+THEME_BINARY_EXTENSIONS = ('.stylebin',)
+THEME_BINARY_MAGIC = b'AVSB'
+THEME_BINARY_VERSION = 2
+
+# 二进制格式中配置值的类型
+VALUE_STRING = 0
+VALUE_INT = 1
+VALUE_COLOR6_LOWER = 2
+VALUE_COLOR6_UPPER = 3
+VALUE_COLOR8_LOWER = 4
+VALUE_COLOR8_UPPER = 5
+
+INT_VALUE_PATTERN = re.compile(r'0|-?[1-9][0-9]*')
+COLOR_LIST_PATTERN = re.compile(r'(?:[0-9a-fA-F]{6},)*[0-9a-fA-F]{6}|(?:[0-9a-fA-F]{8},)*[0-9a-fA-F]{8}')
+
+def get_theme_format(file_path):
+    """根据扩展名判断文件格式: 'json'、'binary' 或 'conf'"""
+    extension = os.path.splitext(str(file_path))[1].lower()
+    if extension in THEME_JSON_EXTENSIONS:
+        return 'json'
+    if extension in THEME_BINARY_EXTENSIONS:
+        return 'binary'
+    return 'conf'
+
+def config_to_sections(config):
+    """将ConfigParser转换为 {section: {key: value}}（保留原始值，不做插值）"""
+    return {section: dict(config.items(section, raw=True)) for section in config.sections()}
+
+def encode_theme_json(config):
+    """将配置导出为带版本号的JSON"""
+    data = {
+        'format': THEME_FORMAT_NAME,
+        'version': THEME_FORMAT_VERSION,
+        'sections': config_to_sections(config),
+    }
+    try:
+        import orjson
+        return orjson.dumps(data)
+    except ImportError:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def decode_theme_json(data):
+    """从JSON读取配置，返回 {section: {key: value}}"""
+    # Windows编辑器保存的JSON常带UTF-8 BOM，与读取style.conf时一样忽略
+    if data.startswith(b'\xef\xbb\xbf'):
+        data = data[3:]
+    try:
+        import orjson
+        theme = orjson.loads(data)
+    except ImportError:
+        theme = json.loads(data)
+
+    if not isinstance(theme, dict) or theme.get('format') != THEME_FORMAT_NAME:
+        raise ValueError("not an AviUtl2 style JSON file")
+    if theme.get('version') != THEME_FORMAT_VERSION:
+        raise ValueError(f"unsupported version: {theme.get('version')}")
+
+    sections = theme.get('sections')
+    if not isinstance(sections, dict):
+        raise ValueError("'sections' must be an object")
+    for section, items in sections.items():
+        if not isinstance(items, dict):
+            raise ValueError(f"section [{section}] must be an object")
+        for key, value in items.items():
+            if not isinstance(value, str):
+                raise ValueError(f"value of {section}.{key} must be a string")
+    return sections
+
+def _classify_value(value):
+    """判断值在二进制格式中的存储类型"""
+    if INT_VALUE_PATTERN.fullmatch(value) and -2**31 <= int(value) < 2**31:
+        return VALUE_INT
+    if COLOR_LIST_PATTERN.fullmatch(value):
+        width8 = len(value.split(',', 1)[0]) == 8
+        if value == value.lower():
+            return VALUE_COLOR8_LOWER if width8 else VALUE_COLOR6_LOWER
+        if value == value.upper():
+            return VALUE_COLOR8_UPPER if width8 else VALUE_COLOR6_UPPER
+    return VALUE_STRING
+
+def _narrow_array(values):
+    """使用能容纳所有元素的最小无符号类型码，减小文件体积"""
+    largest = max(values, default=0)
+    for typecode in ('B', 'H', 'I'):
+        if largest < 1 << (8 * array.array(typecode).itemsize):
+            return array.array(typecode, values)
+    return values
+
+def _pack_array(output, values):
+    """写入一个数组：类型码、元素数量、小端序数据"""
+    if sys.byteorder == 'big':
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    output += struct.pack('<cI', values.typecode.encode('ascii'), len(values))
+    output += values.tobytes()
+
+def _unpack_array(data, offset):
+    """读取一个数组，返回(数组, 新偏移)"""
+    typecode, count = struct.unpack_from('<cI', data, offset)
+    offset += struct.calcsize('<cI')
+    values = array.array(typecode.decode('ascii'))
+    size = count * values.itemsize
+    values.frombytes(data[offset:offset + size])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values, offset + size
+
+def encode_theme_binary(config):
+    """将配置导出为紧凑的二进制格式
+
+    所有值去重后存入值表：字符串与键名共用字符串表，整数保存为int32数组，
+    单个小写6位颜色保存为uint32数组，其余颜色（多个颜色、大写、8位）单独保存。
+    """
+    strings = []
+    string_index = {}
+
+    def add_string(text):
+        if text not in string_index:
+            string_index[text] = len(strings)
+            strings.append(text)
+        return string_index[text]
+
+    section_names = array.array('I')
+    section_counts = array.array('I')
+    entry_keys = array.array('I')
+    entry_values = []
+    value_kinds = {}
+
+    for section in config.sections():
+        items = config.items(section, raw=True)
+        section_names.append(add_string(section))
+        section_counts.append(len(items))
+        for key, value in items:
+            entry_keys.append(add_string(key))
+            entry_values.append(value)
+            if value not in value_kinds:
+                kind = _classify_value(value)
+                value_kinds[value] = kind
+                if kind == VALUE_STRING:
+                    add_string(value)
+
+    ints = array.array('i')
+    colors = array.array('I')
+    other_kinds = array.array('B')
+    other_lengths = array.array('I')
+    other_colors = array.array('I')
+    int_values = []
+    color_values = []
+    other_values = []
+    for value, kind in value_kinds.items():
+        if kind == VALUE_INT:
+            int_values.append(value)
+            ints.append(int(value))
+        elif kind == VALUE_COLOR6_LOWER and ',' not in value:
+            color_values.append(value)
+            colors.append(int(value, 16))
+        elif kind != VALUE_STRING:
+            parts = value.split(',')
+            other_values.append(value)
+            other_kinds.append(kind)
+            other_lengths.append(len(parts))
+            other_colors.extend(int(part, 16) for part in parts)
+
+    # 值表顺序：字符串表、整数、单个颜色、其他颜色
+    value_index = {}
+    for base, values in ((len(strings), int_values),
+                         (len(strings) + len(int_values), color_values),
+                         (len(strings) + len(int_values) + len(color_values), other_values)):
+        for offset, value in enumerate(values):
+            value_index[value] = base + offset
+    entry_value_indexes = array.array('I', (
+        string_index[value] if value_kinds[value] == VALUE_STRING else value_index[value]
+        for value in entry_values
+    ))
+
+    string_lengths = array.array('I', (len(text) for text in strings))
+    string_blob = ''.join(strings).encode('utf-8')
+
+    output = bytearray(struct.pack('<4sH', THEME_BINARY_MAGIC, THEME_BINARY_VERSION))
+    for values in (string_lengths, section_names, section_counts, entry_keys,
+                   entry_value_indexes, other_kinds, other_lengths):
+        _pack_array(output, _narrow_array(values))
+    for values in (ints, colors, other_colors):
+        _pack_array(output, values)
+    output += struct.pack('<I', len(string_blob))
+    output += string_blob
+    return bytes(output)
+
+def _colors_to_hex(colors):
+    """将uint32颜色数组一次性转换为十六进制文本，每个颜色占8个字符"""
+    big_endian = array.array('I', colors)
+    if sys.byteorder == 'little':
+        big_endian.byteswap()
+    return big_endian.tobytes().hex()
+
+def decode_theme_binary(data):
+    """从二进制格式读取配置，返回 {section: {key: value}}"""
+    magic, version = struct.unpack_from('<4sH', data, 0)
+    if magic != THEME_BINARY_MAGIC:
+        raise ValueError("not an AviUtl2 style binary file")
+    if version != THEME_BINARY_VERSION:
+        raise ValueError(f"unsupported version: {version}")
+    offset = struct.calcsize('<4sH')
+
+    arrays = []
+    for _ in range(10):
+        values, offset = _unpack_array(data, offset)
+        arrays.append(values)
+    (string_lengths, section_names, section_counts, entry_keys, entry_values,
+     other_kinds, other_lengths, ints, colors, other_colors) = arrays
+
+    blob_size, = struct.unpack_from('<I', data, offset)
+    offset += 4
+    blob = data[offset:offset + blob_size].decode('utf-8')
+    ends = list(itertools.accumulate(string_lengths))
+    strings = [blob[start:end] for start, end in zip([0] + ends, ends)]
+
+    # 按值表顺序批量生成所有值
+    color_hex = _colors_to_hex(colors)
+    values = strings + list(map(str, ints))
+    values += [color_hex[i + 2:i + 8] for i in range(0, len(color_hex), 8)]
+
+    other_hex = _colors_to_hex(other_colors)
+    position = 0
+    for kind, length in zip(other_kinds, other_lengths):
+        parts = [other_hex[i:i + 8] for i in range(position * 8, (position + length) * 8, 8)]
+        if kind in (VALUE_COLOR6_LOWER, VALUE_COLOR6_UPPER):
+            parts = [part[2:] for part in parts]
+        text = ','.join(parts)
+        values.append(text.upper() if kind in (VALUE_COLOR6_UPPER, VALUE_COLOR8_UPPER) else text)
+        position += length
+
+    sections = {}
+    start = 0
+    for name, count in zip(section_names, section_counts):
+        end = start + count
+        sections[strings[name]] = dict(zip(map(strings.__getitem__, entry_keys[start:end]),
+                                           map(values.__getitem__, entry_values[start:end])))
+        start = end
+    return sections
+
+class StyleWorkspace:
+    """多文件工作区 - 同时打开多个style.conf，切换时无需重新解析"""
+
+    def __init__(self):
+        # 文件名 -> {'path': 原始路径, 'config': ConfigParser}
+        self.documents = {}
+
+    def names(self):
+        """返回已打开的文件名列表"""
+        return list(self.documents)
+
+    def create_config(self):
+        """创建工作区文件使用的配置对象（键和值会被驻留共享）"""
+        return create_style_config(dict_type=InternedDict)
+
+    def add(self, path, config):
+        """将已读取的配置加入工作区，返回在工作区中的名称"""
+        # 同名文件在扩展名前加序号（a.conf, a_2.conf），名称可以直接作为保存时的文件名
+        base_name = os.path.basename(path)
+        root, extension = os.path.splitext(base_name)
+        name = base_name
+        index = 2
+        while name in self.documents:
+            name = f"{root}_{index}{extension}"
+            index += 1
+        self.documents[name] = {'path': path, 'config': config}
+        return name
+
+    def close(self, name):
+        """关闭文件"""
+        self.documents.pop(name, None)
+
+    def get(self, name):
+        """获取文件的配置对象"""
+        if name not in self.documents:
+            raise KeyError(name)
+        return self.documents[name]['config']
+
+    def copy_section(self, source, section, targets):
+        """将源文件的整个section复制到目标文件，返回更新的文件数"""
+        source_config = self.get(source)
+        if section not in source_config:
+            raise KeyError(section)
+        items = source_config.items(section, raw=True)
+
+        count = 0
+        for target in targets:
+            if target == source:
+                continue
+            target_config = self.get(target)
+            if section not in target_config:
+                target_config.add_section(section)
+            for key, value in items:
+                target_config[section][key] = value
+            count += 1
+        return count
+
+    def apply_key(self, section, key, value, targets=None):
+        """将一个配置项写入所有（或指定的）已打开文件，返回更新的文件数"""
+        targets = self.names() if targets is None else targets
+        for target in targets:
+            config = self.get(target)
+            if section not in config:
+                config.add_section(section)
+            config[section][key] = value
+        return len(targets)
+
+    def memory_stats(self):
+        """统计所有文件中的配置值数量以及实际共享的字符串对象数量"""
+        total = 0
+        unique = set()
+        for document in self.documents.values():
+            config = document['config']
+            for section in config.sections():
+                for key, value in config.items(section, raw=True):
+                    total += 1
+                    unique.add(id(value))
+        return {'files': len(self.documents), 'values': total, 'unique_values': len(unique)}
+
+# 编辑器控件对应的配置项，顺序与界面控件的输入输出顺序一致
+# Color.Other 和 Layout.Other 是"其他参数"文本框，每行一个 键=值
+CONTROL_KEYS = [
+    'Font.DefaultFamily', 'Font.Control', 'Font.EditControl', 'Font.PreviewTime',
+    'Font.LayerObject', 'Font.TimeGauge', 'Font.Footer', 'Font.TextEdit', 'Font.Log',
+    'Color.Background', 'Color.Text', 'Color.WindowBorder', 'Color.ButtonBody',
+    'Color.BorderSelect', 'Color.Footer', 'Color.Layer', 'Color.ObjectVideo',
+    'Color.ObjectAudio', 'Color.FooterProgress', 'Color.Other', 'Layout.WindowSeparatorSize',
+    'Layout.ScrollBarSize', 'Layout.FooterHeight', 'Layout.LayerHeight',
+    'Layout.TimeGaugeHeight', 'Layout.PlayerControlHeight', 'Layout.Other', 'Format.FooterLeft', 'Format.FooterRight'
+]
+
+DEFAULT_CONTROL_VALUES = (
+    "Yu Gothic UI", 13, "13,Consolas", 16, 16, 13, 14, "16,Consolas", "12,Consolas",
+    "#202020", "#ffffff", "#585858", "#606060", "#e0e0e0", "#304080", "#404040", "#3040e0", "#d04030",
+    "903838,b84848", "", 7, 20, 24, 32, 32, 42, "",
+    "{CurrentTime} / {TotalTime}  |  {CurrentFrame} / {TotalFrame}",
+    "{SceneName}  |  {Resolution}  |  {FrameRate}  |  {SamplingRate}"
+)
 
 class AviUtlStyleEditor:
-    def __init__(self, language='zh'):
-        self.config = configparser.ConfigParser()
-        # 保持键的大小写 - 禁用自动转换为小写
-        self.config.optionxform = lambda optionstr: optionstr
+    def __init__(self, language='zh', profiler=None):
+        self.config = create_style_config()
         self.current_file = None
+        self.workspace = StyleWorkspace()
         self.language = language
+        self.profiler = profiler
         self.load_language_pack()
 
     def load_language_pack(self):
         """加载语言包"""
         try:
-            language_file = f"locales/{self.language}.json"
+            language_file = os.path.join(get_resource_dir(), "locales", f"{self.language}.json")
             with open(language_file, 'r', encoding='utf-8') as f:
                 self.lang = json.load(f)
         except FileNotFoundError:
@@ -74,38 +649,169 @@ class AviUtlStyleEditor:
         return value
 
     def parse_style_file(self, file_path):
-        """解析style.conf文件"""
+        """解析style.conf文件（也支持导出的JSON和二进制主题文件）"""
         try:
             self.current_file = file_path
+            # 使用新的配置对象，避免合并到之前加载的文件或工作区中的文件
+            self.config = create_style_config()
+            self.read_config_file(file_path, self.config)
+            return True, self._("file.load_success")
+        except Exception as e:
+            return False, self._("file.load_failed", error=str(e))
+
+    def read_config_file(self, file_path, config):
+        """根据扩展名将style.conf、JSON或二进制主题文件读入config"""
+        file_format = get_theme_format(file_path)
+        if file_format == 'conf':
             # 使用UTF-8编码读取文件
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
                 content = f.read()
 
             # 解析INI格式
-            self.config.read_string(content)
-            return True, self._("file.load_success")
-        except Exception as e:
-            return False, self._("file.load_failed", error=str(e))
+            config.read_string(content)
+            return
+
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        decode = decode_theme_json if file_format == 'json' else decode_theme_binary
+        config.read_dict(decode(data))
 
-    def generate_config_content(self):
+    def generate_config_content(self, config=None):
         """生成配置文件内容"""
+        config = self.config if config is None else config
         header = self._("config.header_comment")
         output = f"{header}\n"
 
-        for section in self.config.sections():
+        for section in config.sections():
             output += f"[{section}]\n"
 
             # 添加注释和配置项
-            for key, value in self.config[section].items():
+            for key, value in config[section].items():
                 # 为每个配置项添加适当的注释
                 comment = self.get_comment_for_key(section, key)
                 if comment:
                     output += f"; {comment}\n"
+                # 多行值的后续行需要缩进，否则重新读取时无法解析
+                value = value.replace('\n', '\n\t')
                 output += f"{key}={value}\n"
             output += "\n"
 
         return output
 
+    def open_workspace_files(self, file_paths):
+        """将多个文件打开到工作区，并切换到最后打开的文件
+
+        无法解析的文件会被跳过并在消息中列出文件名，其余文件照常打开；
+        只要有文件打开成功（或没有失败的文件）就返回True
+        """
+        opened = []
+        failed = []
+        for file_path in file_paths:
+            config = self.workspace.create_config()
+            try:
+                self.read_config_file(file_path, config)
+            except Exception as e:
+                failed.append(f"{os.path.basename(file_path)} ({e})")
+                continue
+            opened.append(self.workspace.add(file_path, config))
+
+        messages = []
+        if opened:
+            self.switch_workspace_file(opened[-1])
+            messages.append(self._("workspace.open_success", count=len(opened), **self.workspace.memory_stats()))
+        if failed:
+            messages.append(self._("workspace.open_failed", files="; ".join(failed)))
+        return bool(opened) or not failed, "\n".join(messages)
+
+    def active_workspace_file(self):
+        """返回当前正在编辑的工作区文件名，不在工作区中时返回None"""
+        for name, document in self.workspace.documents.items():
+            if document['config'] is self.config:
+                return name
+        return None
+
+    def close_workspace_file(self, name):
+        """关闭工作区中的文件；关闭的是当前文件时切换到其他文件或清空当前配置"""
+        if name not in self.workspace.documents:
+            return False, self._("workspace.not_open", name=name)
+        was_active = name == self.active_workspace_file()
+        self.workspace.close(name)
+        if was_active:
+            names = self.workspace.names()
+            if names:
+                self.switch_workspace_file(names[0])
+            else:
+                self.config = create_style_config()
+                self.current_file = None
+        return True, self._("workspace.close_success", name=name)
+
+    def commit_workspace_edits(self, values):
+        """将控件中尚未保存的修改写入当前工作区文件，当前文件不在工作区中时返回False"""
+        if self.active_workspace_file() is None:
+            return False
+        self.apply_control_values(values, changed_only=True)
+        return True
+
+    def switch_workspace_file(self, name):
+        """切换当前编辑的文件（直接使用已解析的配置，不重新解析）"""
+        try:
+            document = self.workspace.documents[name]
+        except KeyError:
+            return False, self._("workspace.not_open", name=name)
+        self.config = document['config']
+        self.current_file = document['path']
+        return True, self._("workspace.switch_success", name=name)
+
+    def copy_workspace_section(self, source, section, targets):
+        """将一个section从源文件复制到多个目标文件"""
+        try:
+            count = self.workspace.copy_section(source, section, targets or [])
+        except KeyError as e:
+            return False, self._("workspace.not_found", name=e.args[0])
+        except Exception as e:
+            return False, self._("workspace.operation_failed", error=str(e))
+        return True, self._("workspace.copy_success", section=section, source=source, count=count)
+
+    def apply_key_to_workspace(self, section, key, value):
+        """将一个配置项写入所有已打开的文件"""
+        if not section or not key:
+            return False, self._("workspace.key_required")
+        if section == 'Color':
+            # 与保存配置时相同，颜色值统一转换为纯十六进制格式
+            processed_value = self.process_color_input(value)
+            if not processed_value:
+                return False, self._("workspace.invalid_color", value=value)
+            value = processed_value
+        try:
+            count = self.workspace.apply_key(section, key, value)
+        except Exception as e:
+            return False, self._("workspace.operation_failed", error=str(e))
+        return True, self._("workspace.apply_success", section=section, key=key, count=count)
+
+    def save_workspace_files(self, directory):
+        """将工作区中所有文件保存到指定目录"""
+        directory = directory.strip() or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for name, document in self.workspace.documents.items():
+                self.write_config_file(os.path.join(directory, name), document['config'])
+        except Exception as e:
+            return False, self._("file.save_failed", error=str(e))
+        return True, self._("workspace.save_all_success", count=len(self.workspace.documents), directory=directory)
+
+    def write_config_file(self, file_path, config=None):
+        """根据扩展名将配置写入style.conf、JSON或二进制主题文件"""
+        config = self.config if config is None else config
+        file_format = get_theme_format(file_path)
+        if file_format == 'conf':
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(self.generate_config_content(config))
+            return
+
+        data = encode_theme_json(config) if file_format == 'json' else encode_theme_binary(config)
+        with open(file_path, 'wb') as f:
+            f.write(data)
+
     def get_comment_for_key(self, section, key):
         """为配置项生成注释"""
         try:
@@ -136,10 +842,10 @@ class AviUtlStyleEditor:
         # 如果有逗号，分割成多个颜色进行验证
         if ',' in clean_color:
             colors = clean_color.split(',')
-            return all(re.match(r'^[0-9a-fA-F]{6}$', c) for c in colors)
+            return all(COLOR_HEX_PATTERN.fullmatch(c) for c in colors)
         else:
             # 单个颜色：只支持6位十六进制格式
-            return bool(re.match(r'^[0-9a-fA-F]{6}$', clean_color))
+            return bool(COLOR_HEX_PATTERN.fullmatch(clean_color))
 
     def process_color_input(self, color_input):
         """处理不同格式的颜色输入，转换为6位十六进制格式"""
@@ -149,7 +855,7 @@ class AviUtlStyleEditor:
         color_input = str(color_input).strip()
 
         # 处理RGBA格式: rgba(r, g, b, a)
-        rgba_match = re.match(r'rgba?\s*\(\s*([0-9.]+)\s*,\s*([0-9.]+)\s*,\s*([0-9.]+)(?:\s*,\s*[0-9.]*)?\s*\)', color_input, re.IGNORECASE)
+        rgba_match = COLOR_RGBA_PATTERN.match(color_input)
         if rgba_match:
             try:
                 r = int(float(rgba_match.group(1)))
@@ -162,18 +868,12 @@ class AviUtlStyleEditor:
                 # 转换为6位十六进制
                 hex_color = f"{r:02X}{g:02X}{b:02X}"
                 return hex_color.upper()
-            except (ValueError, IndexError):
+            except (ValueError, IndexError, OverflowError):
                 return None
 
-        # 处理带#的十六进制格式
-        if color_input.startswith('#'):
-            clean_color = color_input[1:]
-            if self.validate_color(clean_color):
-                return clean_color.upper()
-
-        # 处理不带#的十六进制格式
+        # 处理带或不带#的十六进制格式（多个颜色时每个颜色都可能带#）
         if self.validate_color(color_input):
-            return color_input.upper()
+            return color_input.replace('#', '').upper()
 
         # 如果无法处理，返回None
         return None
@@ -196,6 +896,7 @@ class AviUtlStyleEditor:
             comment = self.get_comment_for_key(section_name, key)
             if comment:
                 text += f"; {comment}\n"
+            value = value.replace('\n', '\n\t')
             text += f"{key}={value}\n"
         return text
 
@@ -209,14 +910,191 @@ class AviUtlStyleEditor:
 
         for line in lines:
             line = line.strip()
-            if not line or line.startswith(';') or line.startswith('['):
+            # 与ConfigParser读取style.conf的规则保持一致：跳过注释和section行，以第一个=或:分隔键值
+            if not line or line.startswith((';', '#', '[')):
+                continue
+
+            match = self.config.OPTCRE.match(line)
+            if match:
+                key = match.group('option').strip()
+                value = match.group('value').strip()
+                if key:
+                    self.config[section_name][key] = value
+
+    def control_values(self):
+        """从当前配置读取各控件的值，顺序与CONTROL_KEYS一致"""
+        # 直接返回每个控件的值，确保类型正确
+        # 缺少的分区按空分区处理，无法解析的整数使用默认值，其余控件仍显示文件中的值
+        def section_values(section):
+            return self.config[section] if section in self.config else {}
+
+        def int_value(section, key, default):
+            try:
+                return int(section_values(section).get(key, default))
+            except ValueError:
+                return int(default)
+
+        try:
+            font_default_family = section_values('Font').get('DefaultFamily', 'Yu Gothic UI')
+            font_control = int_value('Font', 'Control', '13')
+            font_edit_control = section_values('Font').get('EditControl', '13,Consolas')
+            font_preview_time = int_value('Font', 'PreviewTime', '16')
+            font_layer_object = int_value('Font', 'LayerObject', '16')
+            font_time_gauge = int_value('Font', 'TimeGauge', '13')
+            font_footer = int_value('Font', 'Footer', '14')
+            font_text_edit = section_values('Font').get('TextEdit', '16,Consolas')
+            font_log = section_values('Font').get('Log', '12,Consolas')
+
+            # 确保颜色值是纯6位十六进制格式，去掉#前缀并验证
+            def process_color_value(value, default):
+                if not value:
+                    return f"#{default}"
+                # 去掉可能存在的#前缀
+                clean_value = value.lstrip('#')
+                # 验证是否为有效的6位十六进制
+                if self.validate_color(clean_value):
+                    return f"#{clean_value}"
+                else:
+                    return f"#{default}"
+
+            color_background = process_color_value(section_values('Color').get('Background'), '202020')
+            color_text = process_color_value(section_values('Color').get('Text'), 'ffffff')
+            color_window_border = process_color_value(section_values('Color').get('WindowBorder'), '585858')
+            color_button_body = process_color_value(section_values('Color').get('ButtonBody'), '606060')
+            color_border_select = process_color_value(section_values('Color').get('BorderSelect'), 'e0e0e0')
+            color_footer = process_color_value(section_values('Color').get('Footer'), '304080')
+            color_layer = process_color_value(section_values('Color').get('Layer'), '404040')
+            color_object_video = process_color_value(section_values('Color').get('ObjectVideo'), '3040e0')
+            color_object_audio = process_color_value(section_values('Color').get('ObjectAudio'), 'd04030')
+            color_footer_progress = section_values('Color').get('FooterProgress', '903838,b84848')
+
+            # 收集所有其他颜色参数（包括Layer颜色）
+            color_other_lines = []
+            if 'Color' in self.config:
+                for key, value in self.config['Color'].items():
+                    # 跳过已处理的已知参数
+                    known_color_keys = {'Background', 'Text', 'WindowBorder', 'ButtonBody', 'BorderSelect',
+                                      'Footer', 'Layer', 'ObjectVideo', 'ObjectAudio', 'FooterProgress'}
+                    if key not in known_color_keys:
+                        # 多行值的后续行缩进，保存时按续行解析
+                        color_other_lines.append(f"{key}={value}".replace('\n', '\n\t'))
+
+            color_other = "\n".join(color_other_lines)
+
+            layout_window_separator_size = int_value('Layout', 'WindowSeparatorSize', '7')
+            layout_scroll_bar_size = int_value('Layout', 'ScrollBarSize', '20')
+            layout_footer_height = int_value('Layout', 'FooterHeight', '24')
+            layout_layer_height = int_value('Layout', 'LayerHeight', '32')
+            layout_time_gauge_height = int_value('Layout', 'TimeGaugeHeight', '32')
+            layout_player_control_height = int_value('Layout', 'PlayerControlHeight', '42')
+
+            format_footer_left = section_values('Format').get('FooterLeft', '{CurrentTime} / {TotalTime}  |  {CurrentFrame} / {TotalFrame}')
+            format_footer_right = section_values('Format').get('FooterRight', '{SceneName}  |  {Resolution}  |  {FrameRate}  |  {SamplingRate}')
+
+            # 检查是否有额外的Layout参数需要处理
+            layout_other_params = {}
+            if 'Layout' in self.config:
+                known_layout_keys = {'WindowSeparatorSize', 'ScrollBarSize', 'FooterHeight', 'LayerHeight', 'TimeGaugeHeight', 'PlayerControlHeight'}
+                for key, value in self.config['Layout'].items():
+                    if key not in known_layout_keys:
+                        layout_other_params[key] = value
+
+            # 格式化Layout其他参数为文本
+            layout_other_text = "\n".join([f"{key}={value}".replace('\n', '\n\t') for key, value in layout_other_params.items()])
+
+            # 添加Layer颜色参数到其他参数中
+            if 'Color' in self.config and 'Layer' in self.config['Color']:
+                layer_color = section_values('Color').get('Layer', '404040')
+                if f"Layer={layer_color}" not in color_other_lines:
+                    if color_other:
+                        color_other += f"\nLayer={layer_color}"
+                    else:
+                        color_other = f"Layer={layer_color}"
+
+            return (font_default_family, font_control, font_edit_control, font_preview_time,
+                    font_layer_object, font_time_gauge, font_footer, font_text_edit, font_log,
+                    color_background, color_text, color_window_border, color_button_body,
+                    color_border_select, color_footer, color_layer, color_object_video,
+                    color_object_audio, color_footer_progress, color_other, layout_window_separator_size,
+                    layout_scroll_bar_size, layout_footer_height, layout_layer_height,
+                    layout_time_gauge_height, layout_player_control_height, layout_other_text,
+                    format_footer_left, format_footer_right)
+
+        except Exception:
+            return DEFAULT_CONTROL_VALUES
+
+    def parse_other_params(self, section, text):
+        """解析"其他参数"文本框（每行一个 键=值，键可带 Color./Layout. 前缀）并写入配置
+
+        与style.conf相同，缩进的行是上一个参数的多行值的后续行
+        """
+        if not text or not text.strip():
+            return
+        prefix = f"{section}."
+        current_key = None
+        for raw_line in text.split('\n'):
+            line = raw_line.strip()
+            if current_key is not None and line and raw_line[:1].isspace():
+                self.config[section][current_key] += f"\n{line}"
+                continue
+            current_key = None
+            if '=' not in line:
+                continue
+            key = line.split('=')[0].strip()
+            if key.startswith(prefix):
+                key = key[len(prefix):]  # 去掉"Color."/"Layout."前缀
+            value = line.split('=', 1)[1].strip()
+            if not key or not value:
+                continue
+            if section not in self.config:
+                self.config.add_section(section)
+            if section == 'Color':
+                # 特殊处理颜色值
+                clean_value = value.lstrip('#')
+                if self.validate_color(clean_value):
+                    value = clean_value
+            self.config[section][key] = value
+            current_key = key
+
+    def apply_control_values(self, values, changed_only=False):
+        """将各控件的值（顺序与CONTROL_KEYS一致）写入当前配置
+
+        changed_only为True时只写入与当前配置读出的值不同的控件，
+        用于切换或保存工作区文件前提交未保存的编辑，不会把控件默认值写入文件
+        """
+        current = self.control_values() if changed_only else None
+        changed = [(control_key.split('.', 1), param_value)
+                   for i, (control_key, param_value) in enumerate(zip(CONTROL_KEYS, values))
+                   if param_value is not None and not (changed_only and param_value == current[i])]
+
+        # 先处理"其他参数"文本框中的内容，专用控件的值优先（如Color.Layer）
+        for (section, key), param_value in changed:
+            if key == 'Other':
+                self.parse_other_params(section, param_value)
+
+        for (section, key), param_value in changed:
+            if key == 'Other':
                 continue
 
-            if '=' in line:
-                key, value = line.split('=', 1)
-                key = key.strip()
-                value = value.strip()
-                self.config[section_name][key] = value
+            if section not in self.config:
+                self.config.add_section(section)
+
+            # 特殊处理颜色值：确保保存为纯6位十六进制格式
+            if section == 'Color' and param_value:
+                # 处理不同格式的颜色输入
+                processed_value = self.process_color_input(str(param_value))
+                if processed_value:
+                    self.config[section][key] = processed_value
+                else:
+                    # 如果处理失败，使用默认值
+                    default_colors = {
+                        'Background': '202020', 'Text': 'ffffff', 'WindowBorder': '585858',
+                        'ButtonBody': '606060', 'BorderSelect': 'e0e0e0', 'Footer': '304080',
+                        'Layer': '404040', 'ObjectVideo': '3040e0', 'ObjectAudio': 'd04030'
+                    }
+                    self.config[section][key] = default_colors.get(key, '000000')
+            else:
+                self.config[section][key] = str(param_value)
 
     def get_parameter_info(self, section, key):
         """获取参数的详细信息"""
@@ -255,8 +1133,16 @@ class AviUtlStyleEditor:
         except:
             return {'type': 'text', 'label': key, 'default': '', 'description': f'{key} parameter'}
 
+    def profiled(self, name, fn):
+        """启用性能分析时包装回调函数，否则原样返回"""
+        if self.profiler is None:
+            return fn
+        return self.profiler.wrap(name, fn)
+
     def create_gradio_interface(self):
         """创建Gradio界面"""
+        # gradio导入耗时较长，延迟到创建界面时再导入
+        import gradio as gr
 
         def load_file(file):
             if file is None:
@@ -266,94 +1152,11 @@ class AviUtlStyleEditor:
             if not success:
                 return message, "", 13, "13,Consolas", 16, 16, 13, 14, "16,Consolas", "12,Consolas", "#202020", "#ffffff", "#585858", "#606060", "#e0e0e0", "#304080", "#404040", "#3040e0", "#d04030", "903838,b84848", "", "", 7, 20, 24, 32, 32, 42, "", "{CurrentTime} / {TotalTime}  |  {CurrentFrame} / {TotalFrame}", "{SceneName}  |  {Resolution}  |  {FrameRate}  |  {SamplingRate}"
 
-            # 直接返回每个控件的值，确保类型正确
-            try:
-                font_default_family = self.config['Font'].get('DefaultFamily', 'Yu Gothic UI')
-                font_control = int(self.config['Font'].get('Control', '13'))
-                font_edit_control = self.config['Font'].get('EditControl', '13,Consolas')
-                font_preview_time = int(self.config['Font'].get('PreviewTime', '16'))
-                font_layer_object = int(self.config['Font'].get('LayerObject', '16'))
-                font_time_gauge = int(self.config['Font'].get('TimeGauge', '13'))
-                font_footer = int(self.config['Font'].get('Footer', '14'))
-                font_text_edit = self.config['Font'].get('TextEdit', '16,Consolas')
-                font_log = self.config['Font'].get('Log', '12,Consolas')
-
-                # 确保颜色值是纯6位十六进制格式，去掉#前缀并验证
-                def process_color_value(value, default):
-                    if not value:
-                        return f"#{default}"
-                    # 去掉可能存在的#前缀
-                    clean_value = value.lstrip('#')
-                    # 验证是否为有效的6位十六进制
-                    if self.validate_color(clean_value):
-                        return f"#{clean_value}"
-                    else:
-                        return f"#{default}"
-
-                color_background = process_color_value(self.config['Color'].get('Background'), '202020')
-                color_text = process_color_value(self.config['Color'].get('Text'), 'ffffff')
-                color_window_border = process_color_value(self.config['Color'].get('WindowBorder'), '585858')
-                color_button_body = process_color_value(self.config['Color'].get('ButtonBody'), '606060')
-                color_border_select = process_color_value(self.config['Color'].get('BorderSelect'), 'e0e0e0')
-                color_footer = process_color_value(self.config['Color'].get('Footer'), '304080')
-                color_layer = process_color_value(self.config['Color'].get('Layer'), '404040')
-                color_object_video = process_color_value(self.config['Color'].get('ObjectVideo'), '3040e0')
-                color_object_audio = process_color_value(self.config['Color'].get('ObjectAudio'), 'd04030')
-                color_footer_progress = self.config['Color'].get('FooterProgress', '903838,b84848')
-
-                # 收集所有其他颜色参数（包括Layer颜色）
-                color_other_lines = []
-                if 'Color' in self.config:
-                    for key, value in self.config['Color'].items():
-                        # 跳过已处理的已知参数
-                        known_color_keys = {'Background', 'Text', 'WindowBorder', 'ButtonBody', 'BorderSelect',
-                                          'Footer', 'Layer', 'ObjectVideo', 'ObjectAudio', 'FooterProgress'}
-                        if key not in known_color_keys:
-                            color_other_lines.append(f"{key}={value}")
-
-                color_other = "\n".join(color_other_lines)
-
-                layout_window_separator_size = int(self.config['Layout'].get('WindowSeparatorSize', '7'))
-                layout_scroll_bar_size = int(self.config['Layout'].get('ScrollBarSize', '20'))
-                layout_footer_height = int(self.config['Layout'].get('FooterHeight', '24'))
-                layout_layer_height = int(self.config['Layout'].get('LayerHeight', '32'))
-                layout_time_gauge_height = int(self.config['Layout'].get('TimeGaugeHeight', '32'))
-                layout_player_control_height = int(self.config['Layout'].get('PlayerControlHeight', '42'))
-
-                format_footer_left = self.config['Format'].get('FooterLeft', '{CurrentTime} / {TotalTime}  |  {CurrentFrame} / {TotalFrame}')
-                format_footer_right = self.config['Format'].get('FooterRight', '{SceneName}  |  {Resolution}  |  {FrameRate}  |  {SamplingRate}')
-
-                # 检查是否有额外的Layout参数需要处理
-                layout_other_params = {}
-                if 'Layout' in self.config:
-                    known_layout_keys = {'WindowSeparatorSize', 'ScrollBarSize', 'FooterHeight', 'LayerHeight', 'TimeGaugeHeight', 'PlayerControlHeight'}
-                    for key, value in self.config['Layout'].items():
-                        if key not in known_layout_keys:
-                            layout_other_params[key] = value
-
-                # 格式化Layout其他参数为文本
-                layout_other_text = "\n".join([f"{key}={value}" for key, value in layout_other_params.items()])
-
-                # 添加Layer颜色参数到其他参数中
-                if 'Color' in self.config and 'Layer' in self.config['Color']:
-                    layer_color = self.config['Color'].get('Layer', '404040')
-                    if f"Layer={layer_color}" not in color_other_lines:
-                        if color_other:
-                            color_other += f"\nLayer={layer_color}"
-                        else:
-                            color_other = f"Layer={layer_color}"
-
-                return (message, font_default_family, font_control, font_edit_control, font_preview_time,
-                        font_layer_object, font_time_gauge, font_footer, font_text_edit, font_log,
-                        color_background, color_text, color_window_border, color_button_body,
-                        color_border_select, color_footer, color_layer, color_object_video,
-                        color_object_audio, color_footer_progress, color_other, layout_window_separator_size,
-                        layout_scroll_bar_size, layout_footer_height, layout_layer_height,
-                        layout_time_gauge_height, layout_player_control_height, layout_other_text,
-                        format_footer_left, format_footer_right)
+            return read_controls(message)
 
-            except Exception as e:
-                return message, "Yu Gothic UI", 13, "13,Consolas", 16, 16, 13, 14, "16,Consolas", "12,Consolas", "#202020", "#ffffff", "#585858", "#606060", "#e0e0e0", "#304080", "#404040", "#3040e0", "#d04030", "903838,b84848", "", "", 7, 20, 24, 32, 32, 42, "", "{CurrentTime} / {TotalTime}  |  {CurrentFrame} / {TotalFrame}", "{SceneName}  |  {Resolution}  |  {FrameRate}  |  {SamplingRate}"
+        def read_controls(message):
+            """从当前配置读取各控件的值"""
+            return (message,) + self.control_values()
 
         def save_config(filename, *args):
             """保存配置文件"""
@@ -365,129 +1168,74 @@ class AviUtlStyleEditor:
                 print("=== 保存函数调试信息 ===")
                 print(f"文件名: {filename}")
                 print(f"参数数量: {len(args)}")
-                print("参数值预览:")
-                for i, arg in enumerate(args):
-                    if i < 10:  # 只显示前10个参数
-                        print(f"  args[{i}] = {arg} (类型: {type(arg)})")
-                if len(args) > 10:
-                    print(f"  ... 还有 {len(args) - 10} 个参数")
-                # 参数映射 - 映射到正确的驼峰式键名
-                param_values = args
-                print(f"参数映射调试: {len(param_values)} 个参数值")
-
-                param_key_mapping = {
-                    0: ('Font', 'DefaultFamily'), 1: ('Font', 'Control'), 2: ('Font', 'EditControl'),
-                    3: ('Font', 'PreviewTime'), 4: ('Font', 'LayerObject'), 5: ('Font', 'TimeGauge'),
-                    6: ('Font', 'Footer'), 7: ('Font', 'TextEdit'), 8: ('Font', 'Log'),
-                    9: ('Color', 'Background'), 10: ('Color', 'Text'), 11: ('Color', 'WindowBorder'),
-                    12: ('Color', 'ButtonBody'), 13: ('Color', 'BorderSelect'), 14: ('Color', 'Footer'),
-                    15: ('Color', 'Layer'), 16: ('Color', 'ObjectVideo'), 17: ('Color', 'ObjectAudio'),
-                    18: ('Color', 'FooterProgress'), 19: ('Color', 'Other'), 20: ('Layout', 'WindowSeparatorSize'),
-                    21: ('Layout', 'ScrollBarSize'), 22: ('Layout', 'FooterHeight'), 23: ('Layout', 'LayerHeight'),
-                    24: ('Layout', 'TimeGaugeHeight'), 25: ('Layout', 'PlayerControlHeight'), 26: ('Layout', 'Other'),
-                    27: ('Format', 'FooterLeft'), 28: ('Format', 'FooterRight')
-                }
-
-                # 处理"其他颜色参数"文本框中的内容
-                if len(param_values) > 19 and param_values[19]:  # Color.Other
-                    other_color_params = param_values[19].strip()
-                    if other_color_params:
-                        for line in other_color_params.split('\n'):
-                            line = line.strip()
-                            if '=' in line and line.startswith('Color.'):
-                                key = line.split('=')[0].strip()
-                                if key.startswith('Color.'):
-                                    color_key = key[6:]  # 去掉"Color."前缀
-                                    value = line.split('=', 1)[1].strip()
-                                    if color_key and value:
-                                        if 'Color' not in self.config:
-                                            self.config.add_section('Color')
-                                        # 特殊处理颜色值
-                                        clean_value = value.lstrip('#')
-                                        if self.validate_color(clean_value):
-                                            self.config['Color'][color_key] = clean_value
-                                        else:
-                                            self.config['Color'][color_key] = value
-                            elif '=' in line:
-                                key = line.split('=')[0].strip()
-                                value = line.split('=', 1)[1].strip()
-                                if key and value:
-                                    if 'Color' not in self.config:
-                                        self.config.add_section('Color')
-                                    # 特殊处理颜色值
-                                    clean_value = value.lstrip('#')
-                                    if self.validate_color(clean_value):
-                                        self.config['Color'][key] = clean_value
-                                    else:
-                                        self.config['Color'][key] = value
-
-                # 处理"其他Layout参数"文本框中的内容
-                if len(param_values) > 26 and param_values[26]:  # Layout.Other
-                    other_layout_params = param_values[26].strip()
-                    if other_layout_params:
-                        for line in other_layout_params.split('\n'):
-                            line = line.strip()
-                            if '=' in line and line.startswith('Layout.'):
-                                key = line.split('=')[0].strip()
-                                if key.startswith('Layout.'):
-                                    layout_key = key[7:]  # 去掉"Layout."前缀
-                                    value = line.split('=', 1)[1].strip()
-                                    if layout_key and value:
-                                        if 'Layout' not in self.config:
-                                            self.config.add_section('Layout')
-                                        self.config['Layout'][layout_key] = value
-                            elif '=' in line:
-                                key = line.split('=')[0].strip()
-                                value = line.split('=', 1)[1].strip()
-                                if key and value:
-                                    if 'Layout' not in self.config:
-                                        self.config.add_section('Layout')
-                                    self.config['Layout'][key] = value
 
                 # 更新配置
-                print("\n配置更新调试:")
-                for i, param_value in enumerate(param_values):
-                    if i in param_key_mapping and param_value is not None:
-                        section, key = param_key_mapping[i]
-                        print(f"  处理参数 {i}: {section}.{key} = {param_value}")
-
-                        if section not in self.config:
-                            self.config.add_section(section)
-
-                        # 特殊处理颜色值：确保保存为纯6位十六进制格式
-                        if section == 'Color' and param_value:
-                            # 处理不同格式的颜色输入
-                            processed_value = self.process_color_input(str(param_value))
-                            print(f"    颜色值处理: '{param_value}' -> '{processed_value}'")
-
-                            if processed_value:
-                                self.config[section][key] = processed_value
-                                print(f"    ✓ 颜色值处理成功: {processed_value}")
-                            else:
-                                # 如果处理失败，使用默认值
-                                default_colors = {
-                                    'Background': '202020', 'Text': 'ffffff', 'WindowBorder': '585858',
-                                    'ButtonBody': '606060', 'BorderSelect': 'e0e0e0', 'Footer': '304080',
-                                    'Layer': '404040', 'ObjectVideo': '3040e0', 'ObjectAudio': 'd04030'
-                                }
-                                default_value = default_colors.get(key, '000000')
-                                self.config[section][key] = default_value
-                                print(f"    ⚠ 颜色值处理失败，使用默认值: {default_value}")
-                        else:
-                            self.config[section][key] = str(param_value)
-                            print(f"    普通参数设置: {param_value}")
-
-                # 生成内容
-                content = self.generate_config_content()
-
-                # 保存文件
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                self.apply_control_values(args)
+
+                # 按扩展名生成内容并保存文件
+                self.write_config_file(filename)
 
                 return self._("file.save_success", filename=filename)
             except Exception as e:
                 return self._("file.save_failed", error=str(e))
 
+        def dump_profile():
+            if self.profiler.dump():
+                return self._("file.save_success", filename=self.profiler.output_file)
+            return self._("file.save_failed", error=self.profiler.output_file)
+
+        def workspace_select_updates(value):
+            """更新工作区相关下拉框的选项"""
+            names = self.workspace.names()
+            return (gr.update(choices=names, value=value),
+                    gr.update(choices=names, value=value),
+                    gr.update(choices=names, value=[]))
+
+        def refresh_controls(message, changed):
+            """当前文件被修改或切换时重新读取控件的值，否则保持控件不变"""
+            if changed:
+                return read_controls(message)
+            return (gr.update(),) * len(load_outputs)
+
+        # 以下工作区操作会切换或读取当前文件，先提交控件中未保存的修改
+        def open_workspace(files, *values):
+            paths = [getattr(f, 'name', f) for f in files or []]
+            if not paths:
+                message = self._("file.select_file")
+                return (message,) + workspace_select_updates(None) + refresh_controls(message, False)
+            self.commit_workspace_edits(values)
+            success, message = self.open_workspace_files(paths)
+            return ((message,) + workspace_select_updates(self.active_workspace_file())
+                    + refresh_controls(message, success))
+
+        def close_workspace_file(name):
+            was_active = name is not None and name == self.active_workspace_file()
+            success, message = self.close_workspace_file(name)
+            names = self.workspace.names()
+            selected = self.active_workspace_file() or (names[0] if names else None)
+            return (message,) + workspace_select_updates(selected) + refresh_controls(message, success and was_active)
+
+        def copy_workspace_section(source, section, targets, *values):
+            self.commit_workspace_edits(values)
+            active = self.active_workspace_file()
+            success, message = self.copy_workspace_section(source, section, targets)
+            changed = success and active != source and active in (targets or [])
+            return (message,) + refresh_controls(message, changed)
+
+        def apply_key_to_workspace(section, key, value, *values):
+            self.commit_workspace_edits(values)
+            success, message = self.apply_key_to_workspace(section, key, value)
+            return (message,) + refresh_controls(message, success and self.active_workspace_file() is not None)
+
+        def switch_workspace_file(name, *values):
+            self.commit_workspace_edits(values)
+            success, message = self.switch_workspace_file(name)
+            return read_controls(message)
+
+        def save_workspace_files(directory, *values):
+            self.commit_workspace_edits(values)
+            return self.save_workspace_files(directory)[1]
+
         # 创建界面
         with gr.Blocks(title=self._("app.title")) as interface:
             gr.Markdown(f"# 🎨 {self._('app.title')}")
@@ -495,7 +1243,8 @@ class AviUtlStyleEditor:
 
             with gr.Row():
                 with gr.Column(scale=1):
-                    file_input = gr.File(label=self._("ui.labels.file_input"), file_types=['.conf', '.txt'])
+                    file_input = gr.File(label=self._("ui.labels.file_input"),
+                                         file_types=['.conf', '.txt'] + list(THEME_JSON_EXTENSIONS + THEME_BINARY_EXTENSIONS))
                     load_btn = gr.Button(self._("ui.buttons.load_file"), variant="primary")
                     status_text = gr.Textbox(label=self._("ui.labels.status"), interactive=False)
 
@@ -648,52 +1397,125 @@ class AviUtlStyleEditor:
                         info="底部栏右侧显示的格式"
                     )
 
+                with gr.TabItem(self._("ui.tabs.workspace")):
+                    gr.Markdown(self._("ui.tabs.workspace_description"))
+                    with gr.Row():
+                        with gr.Column():
+                            workspace_files_input = gr.File(
+                                label=self._("ui.labels.workspace_files"),
+                                file_types=['.conf', '.txt'] + list(THEME_JSON_EXTENSIONS + THEME_BINARY_EXTENSIONS),
+                                file_count="multiple"
+                            )
+                            workspace_open_btn = gr.Button(self._("ui.buttons.open_files"), variant="primary")
+                        with gr.Column():
+                            workspace_file_select = gr.Dropdown(label=self._("ui.labels.workspace_file"), choices=[])
+                            with gr.Row():
+                                workspace_switch_btn = gr.Button(self._("ui.buttons.switch_file"))
+                                workspace_close_btn = gr.Button(self._("ui.buttons.close_file"))
+                            workspace_status = gr.Textbox(label=self._("ui.labels.status"), interactive=False)
+
+                    gr.Markdown(self._("ui.labels.copy_section"))
+                    with gr.Row():
+                        copy_source_select = gr.Dropdown(label=self._("ui.labels.copy_source"), choices=[])
+                        copy_section_select = gr.Dropdown(
+                            label=self._("ui.labels.section"), choices=['Font', 'Color', 'Layout', 'Format'], value='Color'
+                        )
+                        copy_target_select = gr.Dropdown(
+                            label=self._("ui.labels.copy_targets"), choices=[], multiselect=True
+                        )
+                        copy_section_btn = gr.Button(self._("ui.buttons.copy_section"))
+
+                    gr.Markdown(self._("ui.labels.apply_key"))
+                    with gr.Row():
+                        apply_section_select = gr.Dropdown(
+                            label=self._("ui.labels.section"), choices=['Font', 'Color', 'Layout', 'Format'], value='Color'
+                        )
+                        apply_key_input = gr.Textbox(label=self._("ui.labels.key"), placeholder="Background")
+                        apply_value_input = gr.Textbox(label=self._("ui.labels.value"), placeholder="202020")
+                        apply_key_btn = gr.Button(self._("ui.buttons.apply_key"))
+
+                    with gr.Row():
+                        save_all_directory = gr.Textbox(label=self._("ui.labels.save_directory"), value="workspace")
+                        save_all_btn = gr.Button(self._("ui.buttons.save_all"), variant="secondary")
+
                 with gr.TabItem("📄 完整配置预览"):
                     preview_text = gr.Textbox(label="完整配置文件内容", lines=25, interactive=False)
 
+                if self.profiler is not None:
+                    with gr.TabItem(self._("ui.tabs.profile")):
+                        profile_text = gr.Textbox(label=self._("ui.labels.profile_stats"), lines=25, interactive=False)
+                        with gr.Row():
+                            profile_refresh_btn = gr.Button(self._("ui.buttons.refresh_stats"))
+                            # 只有指定了 --profile-output 时才能保存到文件
+                            if self.profiler.output_file:
+                                profile_dump_btn = gr.Button(self._("ui.buttons.dump_stats"))
+                        profile_status = gr.Textbox(label=self._("ui.labels.status"), interactive=False)
+                        profile_refresh_btn.click(fn=self.profiler.format_summary, outputs=[profile_text])
+                        if self.profiler.output_file:
+                            profile_dump_btn.click(
+                                fn=lambda: (self.profiler.format_summary(), dump_profile()),
+                                outputs=[profile_text, profile_status]
+                            )
+
             # 事件绑定
+            control_inputs = [param_controls[key] for key in CONTROL_KEYS]
+            load_outputs = [status_text] + control_inputs
+
             load_btn.click(
-                fn=load_file,
+                fn=self.profiled('load_file', load_file),
                 inputs=[file_input],
-                outputs=[status_text] + [param_controls[key] for key in [
-                    'Font.DefaultFamily', 'Font.Control', 'Font.EditControl', 'Font.PreviewTime',
-                    'Font.LayerObject', 'Font.TimeGauge', 'Font.Footer', 'Font.TextEdit', 'Font.Log',
-                    'Color.Background', 'Color.Text', 'Color.WindowBorder', 'Color.ButtonBody',
-                    'Color.BorderSelect', 'Color.Footer', 'Color.Layer', 'Color.ObjectVideo',
-                    'Color.ObjectAudio', 'Color.FooterProgress', 'Color.Other', 'Layout.WindowSeparatorSize',
-                    'Layout.ScrollBarSize', 'Layout.FooterHeight', 'Layout.LayerHeight',
-                    'Layout.TimeGaugeHeight', 'Layout.PlayerControlHeight', 'Layout.Other', 'Format.FooterLeft', 'Format.FooterRight'
-                ]]
+                outputs=load_outputs
+            )
+
+            # 工作区事件
+            workspace_selects = [workspace_file_select, copy_source_select, copy_target_select]
+            workspace_open_btn.click(
+                fn=self.profiled('open_workspace', open_workspace),
+                inputs=[workspace_files_input] + control_inputs,
+                outputs=[workspace_status] + workspace_selects + load_outputs
+            )
+            workspace_close_btn.click(
+                fn=self.profiled('close_workspace_file', close_workspace_file),
+                inputs=[workspace_file_select],
+                outputs=[workspace_status] + workspace_selects + load_outputs
+            )
+            workspace_switch_btn.click(
+                fn=self.profiled('switch_workspace_file', switch_workspace_file),
+                inputs=[workspace_file_select] + control_inputs,
+                outputs=load_outputs
+            )
+            copy_section_btn.click(
+                fn=self.profiled('copy_section', copy_workspace_section),
+                inputs=[copy_source_select, copy_section_select, copy_target_select] + control_inputs,
+                outputs=[workspace_status] + load_outputs
+            )
+            apply_key_btn.click(
+                fn=self.profiled('apply_key', apply_key_to_workspace),
+                inputs=[apply_section_select, apply_key_input, apply_value_input] + control_inputs,
+                outputs=[workspace_status] + load_outputs
+            )
+            save_all_btn.click(
+                fn=self.profiled('save_workspace', save_workspace_files),
+                inputs=[save_all_directory] + control_inputs,
+                outputs=[workspace_status]
             )
 
             save_btn.click(
-                fn=save_config,
-                inputs=[save_filename] + [param_controls[key] for key in [
-                    'Font.DefaultFamily', 'Font.Control', 'Font.EditControl', 'Font.PreviewTime',
-                    'Font.LayerObject', 'Font.TimeGauge', 'Font.Footer', 'Font.TextEdit', 'Font.Log',
-                    'Color.Background', 'Color.Text', 'Color.WindowBorder', 'Color.ButtonBody',
-                    'Color.BorderSelect', 'Color.Footer', 'Color.Layer', 'Color.ObjectVideo',
-                    'Color.ObjectAudio', 'Color.FooterProgress', 'Color.Other', 'Layout.WindowSeparatorSize',
-                    'Layout.ScrollBarSize', 'Layout.FooterHeight', 'Layout.LayerHeight',
-                    'Layout.TimeGaugeHeight', 'Layout.PlayerControlHeight', 'Format.FooterLeft', 'Format.FooterRight'
-                ]],
+                fn=self.profiled('save_config', save_config),
+                inputs=[save_filename] + control_inputs,
                 outputs=[save_status]
             )
 
             # 实时预览 - 为每个控件添加change事件
-            preview_inputs = [param_controls[key] for key in [
-                'Font.DefaultFamily', 'Font.Control', 'Font.EditControl', 'Font.PreviewTime',
-                'Font.LayerObject', 'Font.TimeGauge', 'Font.Footer', 'Font.TextEdit', 'Font.Log',
-                'Color.Background', 'Color.Text', 'Color.WindowBorder', 'Color.ButtonBody',
-                'Color.BorderSelect', 'Color.Footer', 'Color.Layer', 'Color.ObjectVideo',
-                'Color.ObjectAudio', 'Color.FooterProgress', 'Color.Other', 'Layout.WindowSeparatorSize',
-                'Layout.ScrollBarSize', 'Layout.FooterHeight', 'Layout.LayerHeight',
-                'Layout.TimeGaugeHeight', 'Layout.PlayerControlHeight', 'Format.FooterLeft', 'Format.FooterRight'
-            ]]
+            preview_inputs = control_inputs
 
+            update_preview = self.profiled(
+                'update_preview',
+                lambda *args: self.generate_config_content() if self.config.sections() else ""
+            )
             for control in preview_inputs:
                 control.change(
-                    fn=lambda *args: self.generate_config_content() if self.config.sections() else "",
+                    fn=update_preview,
                     inputs=preview_inputs,
                     outputs=[preview_text]
                 )
@@ -702,6 +1524,7 @@ class AviUtlStyleEditor:
 
     def create_section_controls(self, section_name, param_controls):
         """为指定section创建控件"""
+        import gradio as gr
 
         # 为每个参数创建合适的控件
         for key in ['DefaultFamily', 'Control', 'EditControl', 'PreviewTime', 'LayerObject', 'TimeGauge', 'Footer', 'TextEdit', 'Log'] if section_name == 'Font' else \
@@ -745,16 +1568,89 @@ def main():
     parser = argparse.ArgumentParser(description="AviUtl2 样式配置编辑器")
     parser.add_argument('--lang', '-l', default='zh', choices=['zh', 'en', 'ja'],
                        help='选择界面语言 (zh: 中文, en: 英文, ja: 日文)')
+    parser.add_argument('--profile', action='store_true',
+                       help='启用回调性能分析，在界面中显示"性能统计"标签页')
+    parser.add_argument('--profile-cprofile', action='store_true',
+                       help='性能分析时为每个回调采集cProfile数据（需要 --profile）')
+    parser.add_argument('--profile-tracemalloc', action='store_true',
+                       help='性能分析时使用tracemalloc统计内存分配（需要 --profile）')
+    parser.add_argument('--profile-output', default=None,
+                       help='退出时将性能统计写入指定的JSON文件（需要 --profile）')
+    parser.add_argument('--convert', nargs=2, metavar=('INPUT', 'OUTPUT'), default=None,
+                       help='不启动界面，按扩展名在 .conf/.json/.stylebin 之间转换主题文件后退出')
+    parser.add_argument('--port', type=int, default=7860,
+                       help='服务端口 (默认: 7860)')
+    parser.add_argument('--no-browser', action='store_true',
+                       help='启动后不自动打开浏览器')
+    parser.add_argument('--startup-report', nargs='?', const='-', default=None, metavar='FILE',
+                       help='输出启动各阶段耗时；指定FILE时同时写入JSON文件')
+    parser.add_argument('--exit-after-startup', action='store_true',
+                       help='服务启动完成后立即退出（用于启动性能测试）')
     args = parser.parse_args()
+    STARTUP_TIMER.mark('parse_args')
+
+    # 关闭gradio的使用统计上报，启动时不再发起网络请求（可通过环境变量重新开启）
+    os.environ.setdefault('GRADIO_ANALYTICS_ENABLED', 'False')
+
+    if args.convert:
+        input_file, output_file = args.convert
+        editor = AviUtlStyleEditor(language=args.lang)
+        success, message = editor.parse_style_file(input_file)
+        if not success:
+            print(message)
+            sys.exit(1)
+        try:
+            editor.write_config_file(output_file)
+        except Exception as e:
+            print(editor._("file.save_failed", error=str(e)))
+            sys.exit(1)
+        print(editor._("file.save_success", filename=output_file))
+        return
+
+    profiler = None
+    if args.profile:
+        profiler = CallbackProfiler(
+            use_cprofile=args.profile_cprofile,
+            use_tracemalloc=args.profile_tracemalloc,
+            output_file=args.profile_output
+        )
+
+    editor = AviUtlStyleEditor(language=args.lang, profiler=profiler)
+    STARTUP_TIMER.mark('load_language')
+
+    import gradio  # noqa: F401 - 单独计时gradio的导入耗时
+    STARTUP_TIMER.mark('import_gradio')
 
-    editor = AviUtlStyleEditor(language=args.lang)
     interface = editor.create_gradio_interface()
+    STARTUP_TIMER.mark('build_interface')
+
+    # 不使用inbrowser=True：打开浏览器可能阻塞启动，改为在后台线程中打开
     interface.launch(
         server_name="0.0.0.0",
-        server_port=7860,
+        server_port=args.port,
         share=False,
-        inbrowser=True
+        inbrowser=False,
+        prevent_thread_lock=True
     )
+    STARTUP_TIMER.mark('launch_server')
+
+    if args.startup_report:
+        print(STARTUP_TIMER.format_report())
+        if args.startup_report != '-':
+            with open(args.startup_report, 'w', encoding='utf-8') as f:
+                json.dump(STARTUP_TIMER.report(), f, indent=2)
+
+    if args.exit_after_startup:
+        interface.close()
+        return
+
+    if not args.no_browser:
+        import webbrowser
+        # 监听0.0.0.0时local_url无法在部分系统的浏览器中打开，统一使用localhost
+        browser_url = f"http://localhost:{args.port}/"
+        threading.Thread(target=webbrowser.open, args=(browser_url,), daemon=True).start()
+
+    interface.block_thread()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
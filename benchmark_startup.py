@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AviUtl2 样式配置编辑器 - 启动性能测试
+分别测量源码版本和PyInstaller打包版本从启动到服务就绪的耗时
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_PATH = os.path.join(SCRIPT_DIR, "aviutl2_style_editor.py")
+APP_NAME = "aviutl2_style_editor"
+
+
+# gradio在导入时会读取自身的.py源码(component_meta生成.pyi)，
+# safehttpx和groovy在导入时会读取version.txt，因此需要随包收集
+FROZEN_DATA_PACKAGES = ("gradio", "gradio_client", "safehttpx", "groovy")
+
+SPEC_TEMPLATE = """# -*- mode: python ; coding: utf-8 -*-
+# 由 benchmark_startup.py 生成
+from PyInstaller.utils.hooks import collect_data_files
+
+datas = [({locales!r}, 'locales')]
+for package in {packages!r}:
+    datas += collect_data_files(package)
+
+a = Analysis(
+    [{script!r}],
+    datas=datas,
+    module_collection_mode={{'gradio': 'py'}},
+)
+pyz = PYZ(a.pure)
+exe = EXE(pyz, a.scripts, [], exclude_binaries=True, name={name!r}, console=True)
+coll = COLLECT(exe, a.binaries, a.datas, name={name!r})
+"""
+
+
+def build_frozen(work_dir):
+    """使用PyInstaller构建onedir版本（onefile每次启动都需要解压，启动更慢）
+
+    spec文件、build/和dist/都写入work_dir，不污染仓库目录
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    spec_path = os.path.join(work_dir, f"{APP_NAME}.spec")
+    with open(spec_path, 'w', encoding='utf-8') as f:
+        f.write(SPEC_TEMPLATE.format(
+            locales=os.path.join(SCRIPT_DIR, "locales"),
+            packages=FROZEN_DATA_PACKAGES,
+            script=SCRIPT_PATH,
+            name=APP_NAME,
+        ))
+    command = [
+        sys.executable, "-m", "PyInstaller", "--noconfirm",
+        "--distpath", os.path.join(work_dir, "dist"),
+        "--workpath", os.path.join(work_dir, "build"),
+        spec_path
+    ]
+    print("构建打包版本 / Building frozen app:", " ".join(command))
+    subprocess.run(command, cwd=work_dir, check=True)
+    return os.path.join(work_dir, "dist", APP_NAME, APP_NAME)
+
+
+def run_once(command, port):
+    """运行一次编辑器，返回(总耗时毫秒, 各阶段耗时)"""
+    fd, report_file = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        result = subprocess.run(
+            command + ["--no-browser", "--exit-after-startup", "--port", str(port),
+                       "--startup-report", report_file],
+            cwd=SCRIPT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            sys.stderr.write(result.stderr.decode('utf-8', errors='replace'))
+            raise SystemExit(f"启动失败 / Startup failed (exit code {result.returncode}): {' '.join(command)}")
+        with open(report_file, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        return wall_ms, report['phases_ms']
+    finally:
+        os.remove(report_file)
+
+
+def benchmark(name, command, runs, port):
+    """多次运行并输出各阶段的中位数"""
+    wall_times = []
+    phase_times = {}
+    for _ in range(runs):
+        wall_ms, phases = run_once(command, port)
+        wall_times.append(wall_ms)
+        for phase, elapsed in phases.items():
+            phase_times.setdefault(phase, []).append(elapsed)
+
+    print(f"\n=== {name} ({runs} runs) ===")
+    print(f"  {'phase':<20}{'median(ms)':>12}{'min(ms)':>12}{'max(ms)':>12}")
+    for phase, values in phase_times.items():
+        print(f"  {phase:<20}{statistics.median(values):>12.1f}{min(values):>12.1f}{max(values):>12.1f}")
+    print(f"  {'wall clock':<20}{statistics.median(wall_times):>12.1f}{min(wall_times):>12.1f}{max(wall_times):>12.1f}")
+
+    return {
+        'wall_ms': wall_times,
+        'phases_ms': phase_times,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AviUtl2 样式配置编辑器启动性能测试")
+    parser.add_argument('--runs', type=int, default=5, help='每个版本的运行次数 (默认: 5)')
+    parser.add_argument('--port', type=int, default=7861, help='测试使用的端口 (默认: 7861)')
+    parser.add_argument('--frozen', default=None, help='已构建的打包版本可执行文件路径')
+    parser.add_argument('--build', action='store_true', help='先使用PyInstaller构建打包版本再测试')
+    parser.add_argument('--work-dir', default=os.path.join(tempfile.gettempdir(), f"{APP_NAME}_frozen"),
+                        help='PyInstaller的spec、build和dist目录 (默认: 系统临时目录下)')
+    parser.add_argument('--output', default=None, help='将原始测试数据写入JSON文件')
+    args = parser.parse_args()
+
+    results = {}
+    # 先运行一次预热，排除首次运行时的磁盘缓存和.pyc生成
+    run_once([sys.executable, SCRIPT_PATH], args.port)
+    results['source'] = benchmark("source", [sys.executable, SCRIPT_PATH], args.runs, args.port)
+
+    frozen_path = build_frozen(args.work_dir) if args.build else args.frozen
+    if frozen_path:
+        run_once([frozen_path], args.port)
+        results['frozen'] = benchmark("frozen", [frozen_path], args.runs, args.port)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
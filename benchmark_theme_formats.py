@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AviUtl2 样式配置编辑器 - 主题文件格式测试
+检查JSON和二进制格式的往返一致性，并与解析style.conf的加载速度进行比较
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from aviutl2_style_editor import (  # noqa: E402
+    AviUtlStyleEditor, create_style_config,
+    encode_theme_json, decode_theme_json, encode_theme_binary, decode_theme_binary
+)
+
+
+def load_conf(content):
+    config = create_style_config()
+    config.read_string(content)
+    return config
+
+
+def load_sections(sections):
+    config = create_style_config()
+    config.read_dict(sections)
+    return config
+
+
+def add_other_colors(config, count):
+    """向Color分区添加大量额外参数，模拟大型主题"""
+    if 'Color' not in config:
+        config.add_section('Color')
+    for i in range(count):
+        config['Color'][f'Extra{i}'] = format((i * 2654435761) & 0xffffff, '06x')
+
+
+def check_round_trip(editor, config):
+    """导出后再导入，生成的配置文件内容必须与原始内容一致"""
+    expected = editor.generate_config_content(config)
+    for name, encode, decode in (('json', encode_theme_json, decode_theme_json),
+                                 ('binary', encode_theme_binary, decode_theme_binary)):
+        actual = editor.generate_config_content(load_sections(decode(encode(config))))
+        if actual != expected:
+            raise AssertionError(f"{name} round trip changed the generated config")
+    # 生成的style.conf再次解析后也应保持一致
+    if editor.generate_config_content(load_conf(expected)) != expected:
+        raise AssertionError("conf round trip changed the generated config")
+
+
+def measure(fn, runs):
+    """返回多次运行的耗时中位数（微秒）"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="主题文件格式往返检查与加载速度测试")
+    parser.add_argument('files', nargs='*', default=[os.path.join(SCRIPT_DIR, 'style-zh.conf')],
+                        help='要测试的style.conf文件 (默认: style-zh.conf)')
+    parser.add_argument('--runs', type=int, default=200, help='每项测试的运行次数 (默认: 200)')
+    parser.add_argument('--other-colors', type=int, default=0,
+                        help='额外添加指定数量的Color参数，模拟大型主题')
+    args = parser.parse_args()
+
+    editor = AviUtlStyleEditor(language='en')
+    for file_path in args.files:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            config = load_conf(f.read())
+        if args.other_colors:
+            add_other_colors(config, args.other_colors)
+
+        check_round_trip(editor, config)
+
+        conf_text = editor.generate_config_content(config)
+        json_data = encode_theme_json(config)
+        binary_data = encode_theme_binary(config)
+
+        results = [
+            ('style.conf', len(conf_text.encode('utf-8')), measure(lambda: load_conf(conf_text), args.runs)),
+            ('json', len(json_data), measure(lambda: load_sections(decode_theme_json(json_data)), args.runs)),
+            ('binary', len(binary_data), measure(lambda: load_sections(decode_theme_binary(binary_data)), args.runs)),
+            ('json (decode only)', len(json_data), measure(lambda: decode_theme_json(json_data), args.runs)),
+            ('binary (decode only)', len(binary_data), measure(lambda: decode_theme_binary(binary_data), args.runs)),
+        ]
+
+        baseline = results[0][2]
+        print(f"\n=== {os.path.basename(file_path)} (round trip OK) ===")
+        print(f"  {'format':<22}{'bytes':>10}{'median(us)':>14}{'speedup':>10}")
+        for name, size, elapsed in results:
+            print(f"  {name:<22}{size:>10}{elapsed:>14.1f}{baseline / elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AviUtl2 样式配置编辑器 - 解析器/生成器模糊测试
+使用Hypothesis生成随机和异常的style.conf输入，检查往返一致性，
+并记录大输入的耗时，发现超线性增长时报错
+"""
+
+import argparse
+import atexit
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+
+from hypothesis import HealthCheck, given, note, seed, settings, strategies as st
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from aviutl2_style_editor import (  # noqa: E402
+    AviUtlStyleEditor, create_style_config, COLOR_HEX_PATTERN, CONTROL_KEYS
+)
+
+KNOWN_SECTIONS = ['Font', 'Color', 'Layout', 'Format']
+# 在界面中有专用控件的Color参数，其余参数显示在"其他颜色参数"文本框中
+PICKER_COLOR_KEYS = {key.split('.', 1)[1] for key in CONTROL_KEYS if key.startswith('Color.')} - {'Other'}
+OTHER_COLORS_INDEX = CONTROL_KEYS.index('Color.Other')
+ENCODINGS = ['utf-8', 'utf-8-sig', 'utf-16', 'cp932', 'latin-1']
+
+EDITOR = AviUtlStyleEditor(language='en')
+WORK_DIR = tempfile.mkdtemp(prefix='style_fuzz_')
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+
+# ---- 生成策略 ----
+
+hex_color = st.text(alphabet='0123456789abcdefABCDEF', min_size=6, max_size=6)
+color_value = st.one_of(
+    hex_color,
+    st.lists(hex_color, min_size=1, max_size=4).map(','.join),
+    st.text(alphabet='0123456789abcdef', min_size=8, max_size=8),
+)
+int_value = st.integers(min_value=-10**12, max_value=10**12).map(str)
+text_value = st.text(
+    alphabet=st.characters(blacklist_categories=('Cs',), blacklist_characters='\r\n\x0b\x0c\x1c\x1d\x1e\x85  '),
+    max_size=40
+)
+value_strategy = st.one_of(color_value, int_value, text_value, st.sampled_from(['%', '%%', '%(x)s', '{SceneName}  |  {FrameRate}', '=', ';x', '#x']))
+key_strategy = st.one_of(
+    st.sampled_from(['Background', 'Text', 'Control', 'LayerHeight', 'FooterLeft', 'Other']),
+    st.text(alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Nd', 'Lo')), min_size=1, max_size=16),
+)
+section_strategy = st.one_of(
+    st.sampled_from(KNOWN_SECTIONS + ['DEFAULT']),
+    st.text(alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Nd')), min_size=1, max_size=12),
+)
+
+
+@st.composite
+def style_conf_text(draw):
+    """生成style.conf文本：可能包含重复分区、重复键、注释、空行、缩进行和CRLF换行"""
+    lines = []
+    if draw(st.booleans()):
+        lines.append(';' + draw(text_value))
+    for _ in range(draw(st.integers(min_value=0, max_value=6))):
+        lines.append(f"[{draw(section_strategy)}]")
+        for _ in range(draw(st.integers(min_value=0, max_value=8))):
+            kind = draw(st.integers(min_value=0, max_value=9))
+            if kind == 0:
+                lines.append('')
+            elif kind == 1:
+                lines.append('; ' + draw(text_value))
+            elif kind == 2:
+                lines.append('  ' + draw(text_value))
+            else:
+                separator = draw(st.sampled_from(['=', ' = ', ':']))
+                lines.append(f"{draw(key_strategy)}{separator}{draw(value_strategy)}")
+    newline = draw(st.sampled_from(['\n', '\r\n']))
+    return newline.join(lines) + newline
+
+
+@st.composite
+def valid_style_config(draw):
+    """生成能被ConfigParser接受的配置对象"""
+    config = create_style_config()
+    for section in draw(st.lists(st.sampled_from(KNOWN_SECTIONS), unique=True)):
+        config.add_section(section)
+        # 与解析结果一致：值去掉首尾空白，多行值的每行非空且不以注释符开头
+        value_line = text_value.map(str.strip).filter(lambda line: line and not line.startswith((';', '#')))
+        values = st.one_of(value_strategy.map(str.strip), st.lists(value_line, min_size=2, max_size=3).map('\n'.join))
+        for key, value in draw(st.dictionaries(key_strategy, values, max_size=10)).items():
+            config[section][key] = value
+    return config
+
+
+def reset_editor():
+    EDITOR.config = create_style_config()
+    EDITOR.current_file = None
+
+
+def reparse(content):
+    """重新解析生成的配置文件内容"""
+    config = create_style_config()
+    config.read_string(content)
+    return config
+
+
+def write_temp(data, suffix='.conf', directory=WORK_DIR):
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    return path
+
+
+# ---- 性质测试 ----
+
+@given(text=style_conf_text(), encoding=st.sampled_from(ENCODINGS), bom=st.booleans())
+def check_parse_style_file(text, encoding, bom):
+    """任意输入都不能抛出异常；解析成功时，生成->解析->生成 的结果保持不变"""
+    reset_editor()
+    data = text.encode(encoding, errors='replace')
+    if bom and encoding == 'utf-8':
+        data = b'\xef\xbb\xbf' + data
+    path = write_temp(data)
+    try:
+        success, message = EDITOR.parse_style_file(path)
+    finally:
+        os.remove(path)
+    assert isinstance(message, str)
+    if not success:
+        return
+
+    content = EDITOR.generate_config_content()
+    note(content)
+    assert EDITOR.generate_config_content(reparse(content)) == content
+
+
+@given(text=style_conf_text())
+def check_bom_is_ignored(text):
+    """带UTF-8 BOM的文件与不带BOM的文件解析结果相同"""
+    results = []
+    for data in (text.encode('utf-8'), b'\xef\xbb\xbf' + text.encode('utf-8')):
+        reset_editor()
+        path = write_temp(data)
+        try:
+            success, _ = EDITOR.parse_style_file(path)
+        finally:
+            os.remove(path)
+        results.append((success, EDITOR.generate_config_content() if success else None))
+    assert results[0] == results[1]
+
+
+@given(config=valid_style_config())
+def check_generate_round_trip(config):
+    """合法配置经过 generate_config_content 后重新解析，所有键值保持不变"""
+    content = EDITOR.generate_config_content(config)
+    note(content)
+    parsed = reparse(content)
+    assert parsed.sections() == config.sections()
+    for section in config.sections():
+        assert dict(parsed.items(section, raw=True)) == dict(config.items(section, raw=True))
+
+
+@given(config=valid_style_config().filter(lambda config: 'Color' in config))
+def check_other_colors_round_trip(config):
+    """其他颜色参数：界面读出文本框后原样保存，非专用控件的Color参数保持不变"""
+    reset_editor()
+    EDITOR.config = config
+
+    def other_colors():
+        # 保存时去掉合法颜色值的#前缀
+        items = {}
+        for key, value in EDITOR.config.items('Color', raw=True):
+            if key not in PICKER_COLOR_KEYS:
+                clean_value = value.lstrip('#')
+                items[key] = clean_value if EDITOR.validate_color(clean_value) else value
+        return items
+
+    expected = other_colors()
+    values = EDITOR.control_values()
+    note(values[OTHER_COLORS_INDEX])
+    EDITOR.apply_control_values(values)
+    assert other_colors() == expected
+
+    # 再次读出并保存不应再改变配置
+    saved = EDITOR.generate_config_content()
+    EDITOR.apply_control_values(EDITOR.control_values())
+    assert EDITOR.generate_config_content() == saved
+
+
+@given(color=st.one_of(
+    st.text(max_size=40),
+    color_value,
+    color_value.map(lambda c: '#' + c),
+    st.lists(color_value.map(lambda c: '#' + c), min_size=2, max_size=3).map(','.join),
+    st.tuples(st.text(alphabet='0123456789.', max_size=400), st.text(alphabet='0123456789.', max_size=5)).map(
+        lambda t: f"rgba({t[0]}, {t[1]}, 0, 0.5)"),
+))
+def check_process_color_input(color):
+    """颜色输入：不能抛出异常，结果为None或逗号分隔的纯十六进制颜色，且处理是幂等的"""
+    result = EDITOR.process_color_input(color)
+    if result is None:
+        return
+    assert all(COLOR_HEX_PATTERN.fullmatch(part) for part in result.split(',')), result
+    assert EDITOR.process_color_input(result) == result
+
+
+PROPERTIES = [check_parse_style_file, check_bom_is_ignored, check_generate_round_trip, check_other_colors_round_trip, check_process_color_input]
+
+
+# ---- 压力测试 ----
+
+def build_large_conf(color_entries):
+    """生成包含大量Color参数的style.conf"""
+    lines = ['[Font]', 'Control=13', '[Color]']
+    lines.extend(f"Extra{i}={(i * 2654435761) & 0xffffff:06x}" for i in range(color_entries))
+    lines.extend(['[Layout]', 'LayerHeight=32', '[Format]', 'FooterLeft={CurrentTime}'])
+    return '\n'.join(lines) + '\n'
+
+
+def best_time(fn, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stress_cases(directory):
+    """返回 (名称, 按规模n生成运行函数) 列表，生成的临时文件写入directory"""
+    def parse_and_generate(n):
+        path = write_temp(build_large_conf(n).encode('utf-8'), directory=directory)
+
+        def run():
+            reset_editor()
+            EDITOR.parse_style_file(path)
+            EDITOR.generate_config_content()
+        return run
+
+    def other_colors(n):
+        # 界面读出"其他颜色参数"文本框，保存时再解析回配置
+        config = create_style_config()
+        config.read_string(build_large_conf(n))
+
+        def run():
+            EDITOR.config = config
+            EDITOR.apply_control_values(EDITOR.control_values())
+        return run
+
+    def color_input(n):
+        text = ','.join(['a0b0c0'] * n)
+        return lambda: EDITOR.process_color_input(text)
+
+    return [('parse_and_generate', parse_and_generate),
+            ('other_colors', other_colors),
+            ('process_color_input', color_input)]
+
+
+def run_stress(size, factor, repeat, max_exponent):
+    """以规模n和factor*n运行，估计耗时增长的指数"""
+    records = []
+    failures = []
+    with tempfile.TemporaryDirectory(dir=WORK_DIR) as directory:
+        timings = [(name, best_time(make(size), repeat), best_time(make(size * factor), repeat))
+                   for name, make in stress_cases(directory)]
+    for name, small, large in timings:
+        exponent = math.log(max(large, 1e-9) / max(small, 1e-9)) / math.log(factor)
+        records.append({'case': name, 'n': size, 'n_large': size * factor,
+                        'seconds': small, 'seconds_large': large, 'exponent': exponent})
+        status = 'OK' if exponent <= max_exponent else 'SUPER-LINEAR'
+        print(f"  {name:<24}{size:>8}: {small * 1000:>9.2f} ms  {size * factor:>8}: {large * 1000:>9.2f} ms"
+              f"  exponent {exponent:>5.2f}  {status}")
+        if exponent > max_exponent:
+            failures.append(name)
+    return records, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="style.conf解析器与生成器的模糊测试和压力测试")
+    parser.add_argument('--examples', type=int, default=300, help='每个性质测试的样例数量 (默认: 300)')
+    parser.add_argument('--seed', type=int, default=None, help='固定随机种子以复现结果')
+    parser.add_argument('--stress-size', type=int, default=2500, help='压力测试的基础规模 (默认: 2500)')
+    parser.add_argument('--stress-factor', type=int, default=4, help='压力测试的规模倍数 (默认: 4)')
+    parser.add_argument('--repeat', type=int, default=3, help='压力测试每项重复次数，取最快值 (默认: 3)')
+    parser.add_argument('--max-exponent', type=float, default=1.5,
+                        help='允许的最大耗时增长指数，超过即视为超线性 (默认: 1.5)')
+    parser.add_argument('--timings', default=None, help='将压力测试耗时记录写入JSON文件')
+    args = parser.parse_args()
+
+    settings.register_profile('fuzz', settings(
+        max_examples=args.examples, deadline=None,
+        suppress_health_check=[HealthCheck.too_slow, HealthCheck.data_too_large]
+    ))
+    settings.load_profile('fuzz')
+
+    failed = []
+    print("=== 性质测试 / Property checks ===")
+    for check in PROPERTIES:
+        try:
+            if args.seed is not None:
+                seed(args.seed)(check)()
+            else:
+                check()
+            print(f"  {check.__name__:<32}OK")
+        except Exception:
+            print(f"  {check.__name__:<32}FAILED")
+            traceback.print_exc()
+            failed.append(check.__name__)
+
+    print("\n=== 压力测试 / Stress timings ===")
+    records, stress_failures = run_stress(args.stress_size, args.stress_factor, args.repeat, args.max_exponent)
+    failed.extend(stress_failures)
+
+    if args.timings:
+        with open(args.timings, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2)
+
+    if failed:
+        print(f"\nFAILED: {', '.join(failed)}")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == "__main__":
+    main()
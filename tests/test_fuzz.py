@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""以较小规模运行 fuzz_style_editor.py 的性质测试和压力测试"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('hypothesis')
+
+from hypothesis import HealthCheck, settings  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fuzz_style_editor  # noqa: E402
+
+QUICK = settings(max_examples=50, deadline=None,
+                 suppress_health_check=[HealthCheck.too_slow, HealthCheck.data_too_large])
+
+
+@pytest.mark.parametrize('check', fuzz_style_editor.PROPERTIES, ids=lambda check: check.__name__)
+def test_property(check):
+    QUICK(check)()
+
+
+def test_stress_is_not_super_linear():
+    records, failures = fuzz_style_editor.run_stress(size=1000, factor=4, repeat=3, max_exponent=1.5)
+    assert not failures, records
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""JSON和二进制主题格式的往返测试"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviutl2_style_editor import (  # noqa: E402
+    AviUtlStyleEditor, create_style_config, THEME_FORMAT_NAME, THEME_FORMAT_VERSION,
+    encode_theme_json, decode_theme_json, encode_theme_binary, decode_theme_binary
+)
+
+STYLE_CONF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'style-zh.conf')
+
+EDGE_CASES = {
+    'Color': {
+        'Lower': 'a0b0c0',
+        'Upper': 'A0B0C0',
+        'Mixed': 'A0b0C0',
+        'Alpha': 'c8303080',
+        'AlphaUpper': 'C8303080',
+        'List': '903838,b84848',
+        'ListUpper': '903838,B84848',
+        'Repeated': 'a0b0c0',
+    },
+    'Layout': {'Zero': '0', 'Negative': '-7', 'Leading': '007', 'Huge': '99999999999'},
+    'Format': {'Empty': '', 'Percent': '100%', 'Lines': 'a\nb', 'Unicode': '{SceneName} | 日本語'},
+}
+
+
+def load_sections(sections):
+    config = create_style_config()
+    config.read_dict(sections)
+    return config
+
+
+@pytest.mark.parametrize('encode, decode', [
+    (encode_theme_json, decode_theme_json),
+    (encode_theme_binary, decode_theme_binary),
+])
+def test_round_trip_matches_generated_config(encode, decode):
+    editor = AviUtlStyleEditor(language='en')
+    config = create_style_config()
+    with open(STYLE_CONF, 'r', encoding='utf-8') as f:
+        config.read_string(f.read())
+    config.read_dict(EDGE_CASES)
+
+    restored = load_sections(decode(encode(config)))
+    assert editor.generate_config_content(restored) == editor.generate_config_content(config)
+
+
+@pytest.mark.parametrize('extension', ['.json', '.stylebin'])
+def test_workspace_opens_exported_themes(tmp_path, extension):
+    editor = AviUtlStyleEditor(language='en')
+    assert editor.parse_style_file(STYLE_CONF)[0]
+    expected = editor.generate_config_content()
+    path = str(tmp_path / f'theme{extension}')
+    editor.write_config_file(path)
+
+    success, _ = editor.open_workspace_files([path])
+    assert success
+    assert editor.generate_config_content(editor.workspace.get(f'theme{extension}')) == expected
+
+
+def test_json_with_bom_is_accepted():
+    config = load_sections(EDGE_CASES)
+    assert decode_theme_json(b'\xef\xbb\xbf' + encode_theme_json(config)) == decode_theme_json(encode_theme_json(config))
+
+
+@pytest.mark.parametrize('sections', [
+    [],
+    {'Color': ['Background']},
+    {'Color': {'Background': 202020}},
+])
+def test_json_rejects_malformed_sections(sections):
+    data = json.dumps({'format': THEME_FORMAT_NAME, 'version': THEME_FORMAT_VERSION, 'sections': sections})
+    with pytest.raises(ValueError):
+        decode_theme_json(data.encode('utf-8'))
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""多文件工作区的回归测试"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aviutl2_style_editor import AviUtlStyleEditor, CONTROL_KEYS  # noqa: E402
+
+A_CONF = "[Color]\nBackground=111111\n[Layout]\nLayerHeight=30\n"
+B_CONF = "[Color]\nBackground=222222\nText=ffffff\n"
+
+
+def write_file(directory, name, content):
+    path = directory / name
+    path.write_text(content, encoding='utf-8')
+    return str(path)
+
+
+def section_items(config, section):
+    return dict(config.items(section, raw=True))
+
+
+def test_load_after_switch_leaves_workspace_document_unchanged(tmp_path):
+    editor = AviUtlStyleEditor(language='en')
+    a_path = write_file(tmp_path, 'a.conf', A_CONF)
+    b_path = write_file(tmp_path, 'b.conf', B_CONF)
+
+    editor.open_workspace_files([a_path])
+    editor.switch_workspace_file('a.conf')
+    success, _ = editor.parse_style_file(b_path)
+
+    assert success
+    document = editor.workspace.get('a.conf')
+    assert document is not editor.config
+    assert section_items(document, 'Color') == {'Background': '111111'}
+    assert section_items(document, 'Layout') == {'LayerHeight': '30'}
+    assert section_items(editor.config, 'Color') == {'Background': '222222', 'Text': 'ffffff'}
+    assert 'Layout' not in editor.config
+
+
+def test_closing_active_document_switches_to_remaining_one(tmp_path):
+    editor = AviUtlStyleEditor(language='en')
+    paths = [write_file(tmp_path, 'a.conf', A_CONF), write_file(tmp_path, 'b.conf', B_CONF)]
+    editor.open_workspace_files(paths)
+    assert editor.active_workspace_file() == 'b.conf'
+
+    editor.close_workspace_file('b.conf')
+    assert editor.active_workspace_file() == 'a.conf'
+    assert editor.current_file == paths[0]
+
+    editor.close_workspace_file('a.conf')
+    assert editor.active_workspace_file() is None
+    assert editor.current_file is None
+    assert editor.config.sections() == []
+
+
+def test_duplicate_names_keep_extension_when_saved(tmp_path):
+    editor = AviUtlStyleEditor(language='en')
+    first = tmp_path / 'one'
+    second = tmp_path / 'two'
+    first.mkdir()
+    second.mkdir()
+    editor.open_workspace_files([write_file(first, 'a.conf', A_CONF), write_file(second, 'a.conf', B_CONF)])
+    assert editor.workspace.names() == ['a.conf', 'a_2.conf']
+
+    output = tmp_path / 'out'
+    success, _ = editor.save_workspace_files(str(output))
+    assert success
+    assert sorted(os.listdir(output)) == ['a.conf', 'a_2.conf']
+
+
+def test_apply_key_validates_colors(tmp_path):
+    editor = AviUtlStyleEditor(language='en')
+    editor.open_workspace_files([write_file(tmp_path, 'a.conf', A_CONF), write_file(tmp_path, 'b.conf', B_CONF)])
+
+    success, _ = editor.apply_key_to_workspace('Color', 'Background', '#zzz')
+    assert not success
+    assert editor.workspace.get('a.conf')['Color']['Background'] == '111111'
+
+    success, _ = editor.apply_key_to_workspace('Color', 'Background', '#abcdef')
+    assert success
+    for name in editor.workspace.names():
+        assert editor.workspace.get(name)['Color']['Background'] == 'ABCDEF'
+
+
+def test_open_skips_unreadable_files_and_names_them(tmp_path):
+    editor = AviUtlStyleEditor(language='en')
+    good = write_file(tmp_path, 'a.conf', A_CONF)
+    bad = write_file(tmp_path, 'bad.conf', "Background=111111\n")
+
+    success, message = editor.open_workspace_files([good, bad])
+    assert success
+    assert editor.workspace.names() == ['a.conf']
+    assert editor.active_workspace_file() == 'a.conf'
+    assert 'bad.conf' in message
+
+    success, message = editor.open_workspace_files([bad])
+    assert not success
+    assert 'bad.conf' in message
+
+
+def test_copy_section_into_other_file(tmp_path):
+    editor = AviUtlStyleEditor(language='en')
+    editor.open_workspace_files([write_file(tmp_path, 'a.conf', A_CONF), write_file(tmp_path, 'b.conf', B_CONF)])
+
+    success, _ = editor.copy_workspace_section('a.conf', 'Layout', ['b.conf'])
+    assert success
+    target = editor.workspace.get('b.conf')
+    assert section_items(target, 'Layout') == {'LayerHeight': '30'}
+    assert section_items(target, 'Color') == {'Background': '222222', 'Text': 'ffffff'}
+
+
+def test_identical_values_are_shared_between_files(tmp_path):
+    editor = AviUtlStyleEditor(language='en')
+    editor.open_workspace_files([write_file(tmp_path, 'a.conf', A_CONF), write_file(tmp_path, 'b.conf', A_CONF)])
+
+    a = editor.workspace.get('a.conf')['Color']['Background']
+    b = editor.workspace.get('b.conf')['Color']['Background']
+    assert a is b
+    stats = editor.workspace.memory_stats()
+    assert stats['values'] == 4
+    assert stats['unique_values'] < stats['values']
+
+
+def test_unsaved_control_edits_are_kept_when_switching(tmp_path):
+    editor = AviUtlStyleEditor(language='en')
+    editor.open_workspace_files([write_file(tmp_path, 'a.conf', A_CONF), write_file(tmp_path, 'b.conf', B_CONF)])
+    values = list(editor.control_values())
+    values[CONTROL_KEYS.index('Color.Background')] = '#123456'
+
+    assert editor.commit_workspace_edits(values)
+    editor.switch_workspace_file('a.conf')
+
+    # 只写入修改过的控件，未出现在文件中的默认值不会被加入
+    document = editor.workspace.get('b.conf')
+    assert section_items(document, 'Color') == {'Background': '123456', 'Text': 'ffffff'}
+    assert document.sections() == ['Color']
+
+    output = tmp_path / 'out'
+    editor.save_workspace_files(str(output))
+    assert 'Background=123456' in (output / 'b.conf').read_text(encoding='utf-8')
+
+
+def test_apply_control_values_parses_other_params():
+    editor = AviUtlStyleEditor(language='en')
+    values = list(editor.control_values())
+    values[CONTROL_KEYS.index('Color.Other')] = "Border=#909090\nColor.Grid=a0a0a0\nLayer=111111"
+    values[CONTROL_KEYS.index('Layout.Other')] = "Layout.TitleHeaderHeight=18"
+
+    editor.apply_control_values(values)
+    assert editor.config['Color']['Border'] == '909090'
+    assert editor.config['Color']['Grid'] == 'a0a0a0'
+    # 专用的颜色选择器优先于"其他参数"中的同名参数
+    assert editor.config['Color']['Layer'] == '404040'
+    assert editor.config['Layout']['TitleHeaderHeight'] == '18'
+    assert 'Other' not in editor.config['Color']
+    assert 'Other' not in editor.config['Layout']